@@ -1,10 +1,19 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+from collections import OrderedDict, deque
 from pathlib import Path
 from datetime import datetime
+import asyncio
+import gzip
+import heapq
+import json
+import re
+import time
 import uuid
 import os
 import logging
@@ -19,6 +28,17 @@ except ImportError:
     Client = None
     print("⚠️ Supabase library not available - running without Supabase support")
 
+# Optional compression codecs; gzip from the stdlib is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Load env vars
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -69,9 +89,987 @@ class GeneratedProject(BaseModel):
     skills: List[str]
     steps: List[str]
 
+class ProjectStatusUpdate(BaseModel):
+    user_id: str
+    status: str
+
+# Cohort Assignment Models
+class CohortStudent(BaseModel):
+    student_id: str
+    params: ProjectParams
+
+class CohortRequest(BaseModel):
+    students: List[CohortStudent]
+    inventory: Dict[str, int] = Field(default_factory=dict)
+    componentMap: Dict[str, str] = Field(default_factory=dict)
+
+class CohortAssignment(BaseModel):
+    student_id: str
+    title: Optional[str] = None
+    projectType: str
+    difficulty: str
+    components: List[str] = Field(default_factory=list)
+    interestScore: float = 0.0
+
+class CohortAssignmentResult(BaseModel):
+    assignments: List[CohortAssignment]
+    unassigned: List[str]
+    distinctTitles: int
+    remainingStock: Dict[str, int]
+    untrackedComponents: List[str] = Field(default_factory=list)
+    unmatchedInventory: List[str] = Field(default_factory=list)
+
 # Temporary in-memory storage (instead of Mongo)
 status_checks = []
 
+# ----- PROJECT EVENTS (SSE) -----
+PROJECT_STATUSES = {"planning", "in-progress", "completed", "abandoned"}
+EVENT_REPLAY_SIZE = 100         # events kept per user for Last-Event-ID replay
+EVENT_HISTORY_TTL_SECONDS = 300 # replay buffers kept this long after the last stream closes
+SUBSCRIBER_QUEUE_SIZE = 64      # pending events before a slow client is dropped
+SSE_HEARTBEAT_SECONDS = 15
+SSE_RETRY_MS = 2000             # browser reconnect delay after a dropped stream
+
+
+class EventHistory:
+    """Replay buffer for one user; events with id <= floor are no longer known"""
+
+    __slots__ = ("events", "floor", "idle_since")
+
+    def __init__(self, floor: int, replay_size: int):
+        self.events: deque = deque(maxlen=replay_size)
+        self.floor = floor
+        self.idle_since: Optional[float] = None
+
+
+class ProjectEventBroker:
+    """
+    In-process pub/sub for dashboard updates.
+
+    Each SSE connection owns a bounded asyncio.Queue, so an idle client costs
+    one suspended coroutine and no database traffic. Users with an open
+    stream (or one that closed within the TTL) keep a small ring buffer of
+    recent events so a reconnecting client can resume from its Last-Event-ID.
+    When that resume cannot be served completely the client receives a
+    `resync` event instead and should refetch its projects and stats.
+    """
+
+    def __init__(self, replay_size: int = EVENT_REPLAY_SIZE, history_ttl: float = EVENT_HISTORY_TTL_SECONDS):
+        # Seeded from the clock so ids from before a restart are always older
+        # than any buffer this process holds and resume as a resync
+        self._next_id = int(time.time() * 1000)
+        self._replay_size = replay_size
+        self._history_ttl = history_ttl
+        self._history: Dict[str, EventHistory] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def publish(self, user_id: str, event: str, data: dict) -> int:
+        event_id = self._next_id
+        self._next_id += 1
+        message = (event_id, event, data)
+        self._prune_histories()
+
+        # Nobody can resume a stream that was never opened, so only users
+        # with a live or recently closed stream pay for a replay buffer
+        history = self._history.get(user_id)
+        if history is not None:
+            if len(history.events) == history.events.maxlen:
+                history.floor = history.events[0][0]
+            history.events.append(message)
+
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Client is not keeping up: drop its backlog and close the stream.
+                # The browser reconnects with Last-Event-ID and replays from history.
+                self.unsubscribe(user_id, queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        return event_id
+
+    def subscribe(self, user_id: str, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        history = self._history.get(user_id)
+
+        if last_event_id is not None:
+            missed = [m for m in history.events if m[0] > last_event_id] if history else []
+            # Unknown ids (evicted, pruned or from before a restart) and
+            # backlogs larger than the queue cannot be replayed faithfully
+            if (history is None or last_event_id < history.floor
+                    or last_event_id >= self._next_id or len(missed) > SUBSCRIBER_QUEUE_SIZE):
+                queue.put_nowait((self._next_id - 1, "resync", {}))
+            else:
+                for message in missed:
+                    queue.put_nowait(message)
+
+        if history is None:
+            history = self._history[user_id] = EventHistory(self._next_id - 1, self._replay_size)
+        history.idle_since = None
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[user_id]
+            history = self._history.get(user_id)
+            if history is not None:
+                history.idle_since = time.monotonic()
+
+    def _prune_histories(self) -> None:
+        cutoff = time.monotonic() - self._history_ttl
+        expired = [
+            user_id for user_id, history in self._history.items()
+            if history.idle_since is not None and history.idle_since <= cutoff
+        ]
+        for user_id in expired:
+            del self._history[user_id]
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._subscribers
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self._subscribers.values())
+
+    def history_count(self) -> int:
+        return len(self._history)
+
+
+project_events = ProjectEventBroker()
+
+
+def format_sse(event_id: int, event: str, data: dict) -> str:
+    payload = json.dumps(data, default=str, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+# ----- RESPONSE COMPRESSION -----
+MIN_COMPRESS_SIZE = 1024        # bytes; smaller bodies are not worth the CPU
+COMPRESSED_CACHE_SIZE = 256     # template bodies whose compressed variants are kept
+COMPRESSION_KEY = "compression_key"
+
+# Fast settings for per-request bodies, maximum settings for cached ones
+# since those are compressed once and served many times. Only endpoints
+# that mark their body as template-derived (request.state.compression_key)
+# are cached; personalized bodies always take the fast path.
+_FAST_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+_CACHED_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this server can produce, in order of preference"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+SUPPORTED_ENCODINGS = supported_encodings()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding allowed by an Accept-Encoding header"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressedVariantCache:
+    """
+    LRU of compressed bodies keyed by the template that produced them.
+
+    A generated project without personalization is fully determined by its
+    (project type, skill level, title), so each such body is compressed
+    once per process at maximum level and served from here afterwards.
+    """
+
+    def __init__(self, max_entries: int = COMPRESSED_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template_key: tuple, body: bytes, encoding: str) -> bytes:
+        key = (template_key, encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compressed
+
+        self.misses += 1
+        compressed = compress_body(body, encoding, _CACHED_LEVELS[encoding])
+        self._entries[key] = compressed
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+
+compressed_variants = CompressedVariantCache()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses buffered responses with the best codec
+    the client accepts. Streaming responses (SSE) and bodies that already
+    carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Endpoints flag template-derived bodies through request.state
+        state = scope.setdefault("state", {})
+        start_message = None
+        body_parts: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" in headers or content_type.startswith(b"text/event-stream"):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = []
+            vary = b"Accept-Encoding"
+            for k, v in start_message.get("headers", []):
+                if k.lower() == b"vary":
+                    vary = v + b", Accept-Encoding"
+                elif k.lower() != b"content-length":
+                    headers.append((k, v))
+            headers.append((b"vary", vary))
+
+            if len(body) >= self.minimum_size:
+                template_key = state.get(COMPRESSION_KEY)
+                if template_key is not None:
+                    body = compressed_variants.get(template_key, body, encoding)
+                else:
+                    body = compress_body(body, encoding, _FAST_LEVELS[encoding])
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+# ----- PROJECT TEMPLATES -----
+# Enhanced project configurations with ATAL components
+PROJECT_CONFIGS = {
+    "robotics": {
+        "components_base": [
+            "Arduino Uno R3 (ATmega328P Microcontroller)",
+            "L298N Motor Driver Module (Dual H-Bridge)",
+            "2x BO DC Geared Motors with Wheels (60-200 RPM)",
+            "2WD Robot Chassis (Acrylic with Battery Holder)",
+            "HC-SR04 Ultrasonic Sensor (2-400cm range)",
+            "4xAA Battery Holder with ON/OFF Switch",
+            "Jumper Wires (Male-Male, Male-Female)",
+            "Mini Breadboard 400 points"
+        ],
+        "skills_base": [
+            "Arduino programming basics (C/C++)",
+            "PWM (Pulse Width Modulation) for motor speed control",
+            "Ultrasonic sensor interfacing and distance measurement",
+            "H-Bridge motor driver operation and direction control",
+            "Robot kinematics and movement logic",
+            "Power management for mobile robots"
+        ],
+        "cost_range": {"beginner": "₹800-1200", "intermediate": "₹1200-2000", "advanced": "₹2000-3500", "expert": "₹3500-6000"},
+        "learning_outcomes": [
+            "Understand basics of mobile robotics and actuation",
+            "Learn motor control using PWM signals",
+            "Master sensor integration for autonomous behavior",
+            "Develop problem-solving skills through robot debugging"
+        ]
+    },
+    "iot": {
+        "components_base": [
+            "ESP32 DevKit (Dual-core WiFi + Bluetooth)",
+            "DHT22 Temperature & Humidity Sensor (High precision)",
+            "BMP280 Barometric Pressure Sensor (I2C)",
+            "0.96\" OLED Display 128x64 (I2C Interface)",
+            "Mini Breadboard with Jumper Wires",
+            "5V 2A Power Adapter or USB Cable",
+            "Micro USB Cable for Programming"
+        ],
+        "skills_base": [
+            "ESP32 programming with Arduino IDE/MicroPython",
+            "WiFi connectivity and HTTP requests",
+            "I2C communication protocol",
+            "IoT platforms (ThingSpeak, Blynk, Firebase)",
+            "Data visualization and cloud integration",
+            "Sensor data processing and filtering"
+        ],
+        "cost_range": {"beginner": "₹600-1000", "intermediate": "₹1000-1800", "advanced": "₹1800-3000", "expert": "₹3000-5000"},
+        "learning_outcomes": [
+            "Master wireless communication protocols",
+            "Learn cloud-based data storage and retrieval",
+            "Understand IoT architecture and data flow",
+            "Create web dashboards for monitoring"
+        ]
+    },
+    "electronics": {
+        "components_base": [
+            "Arduino Nano (Compact ATmega328P board)",
+            "Resistor Kit (10Ω to 1MΩ, 1/4W, ±5%)",
+            "LED Assortment (5mm - Red, Green, Blue, Yellow, White)",
+            "Ceramic Capacitor Kit (10pF to 100nF)",
+            "2N2222 NPN Transistors (for switching)",
+            "1N4007 Diodes (Rectifier, 1000V 1A)",
+            "Solderless Breadboard 830 points",
+            "Digital Multimeter for measurements"
+        ],
+        "skills_base": [
+            "Basic circuit analysis (Ohm's Law, Kirchhoff's Laws)",
+            "LED current limiting resistor calculation",
+            "Transistor as switch and amplifier",
+            "Capacitor charging/discharging characteristics",
+            "PCB design fundamentals",
+            "Soldering techniques and practices"
+        ],
+        "cost_range": {"beginner": "₹500-900", "intermediate": "₹900-1500", "advanced": "₹1500-2500", "expert": "₹2500-4000"},
+        "learning_outcomes": [
+            "Build strong foundation in analog electronics",
+            "Master breadboard prototyping techniques",
+            "Learn to read and create circuit diagrams",
+            "Develop systematic troubleshooting skills"
+        ]
+    },
+    "automation": {
+        "components_base": [
+            "Arduino Uno R3 / ESP32 (for WiFi control)",
+            "4-Channel 5V Relay Module (10A 250V AC rating)",
+            "PIR Motion Sensor HC-SR501 (7m range, 120° angle)",
+            "LDR (Light Dependent Resistor) with 10kΩ resistor",
+            "DHT11 Temperature & Humidity Sensor",
+            "16x2 LCD Display with I2C Module",
+            "5V 2A Power Supply",
+            "Connecting Wires and Terminal Blocks"
+        ],
+        "skills_base": [
+            "Relay control and isolation techniques",
+            "Sensor-based decision making logic",
+            "Interrupt handling for motion detection",
+            "Home automation protocols",
+            "Safety considerations for AC appliances",
+            "Timer and scheduling implementations"
+        ],
+        "cost_range": {"beginner": "₹700-1200", "intermediate": "₹1200-2000", "advanced": "₹2000-3500", "expert": "₹3500-5500"},
+        "learning_outcomes": [
+            "Understand home automation systems",
+            "Learn safe AC appliance control",
+            "Master sensor fusion for smart decisions",
+            "Create practical IoT automation solutions"
+        ]
+    },
+    "sensors": {
+        "components_base": [
+            "Arduino Uno R3 (Microcontroller)",
+            "DHT22 (Temp & Humidity - High accuracy)",
+            "MQ-135 Air Quality Sensor (NH3, NOx, CO2)",
+            "BH1750 Digital Light Sensor (I2C, 1-65535 lux)",
+            "20x4 LCD Display with I2C",
+            "MicroSD Card Module (for data logging)",
+            "DS3231 RTC Module (±2ppm accuracy)",
+            "Breadboard and Connecting Wires"
+        ],
+        "skills_base": [
+            "Multi-sensor integration and management",
+            "I2C bus communication and addressing",
+            "Data logging to SD card (CSV format)",
+            "Real-time clock for timestamping",
+            "Sensor calibration techniques",
+            "Data visualization using Serial Plotter"
+        ],
+        "cost_range": {"beginner": "₹800-1400", "intermediate": "₹1400-2200", "advanced": "₹2200-3500", "expert": "₹3500-5500"},
+        "learning_outcomes": [
+            "Master sensor interfacing techniques",
+            "Learn data acquisition and logging",
+            "Understand environmental monitoring systems",
+            "Develop data analysis skills"
+        ]
+    }
+}
+
+# Skill level adjustments
+TIME_ESTIMATES = {
+    "beginner": "1-2 weeks (8-15 hours total)",
+    "intermediate": "2-4 weeks (20-35 hours total)", 
+    "advanced": "4-8 weeks (40-70 hours total)",
+    "expert": "8-12 weeks (80-120 hours total)"
+}
+
+# Enhanced project titles with real-world applications
+PROJECT_TITLES = {
+    "robotics": {
+        "beginner": ["Line Following Robot for Warehouse Navigation", "Obstacle Avoiding Car with Ultrasonic Sensors"],
+        "intermediate": ["Bluetooth Controlled Robot with Mobile App", "Gesture Controlled Robot using Accelerometer"],
+        "advanced": ["Autonomous Maze Solving Robot with Wall Following", "Voice Controlled Robotic Arm with Inverse Kinematics"],
+        "expert": ["SLAM-based Mapping Robot with ROS", "Quadruped Walking Robot with Servo Control"]
+    },
+    "iot": {
+        "beginner": ["WiFi Weather Station with Web Dashboard", "Smart Plant Monitoring System with Alerts"],
+        "intermediate": ["IoT Home Security System with Mobile Notifications", "Remote Controlled Appliances via Blynk App"],
+        "advanced": ["Multi-Room Environmental Monitoring Network", "Smart Energy Meter with Power Analytics"],
+        "expert": ["Complete Smart Home System with Voice Control", "Industrial IoT Sensor Network with MQTT"]
+    },
+    "electronics": {
+        "beginner": ["LED Chaser with 555 Timer IC", "Temperature Indicator using LM35 and LEDs"],
+        "intermediate": ["Digital Voltmeter with LCD Display", "Automatic Night Light using LDR and Transistor"],
+        "advanced": ["Function Generator with Multiple Waveforms", "Battery Capacity Tester with Data Logging"],
+        "expert": ["Digital Oscilloscope using Arduino", "Impedance Analyzer for Component Testing"]
+    },
+    "automation": {
+        "beginner": ["Automatic Room Light using PIR Sensor", "Temperature Controlled Fan with LCD"],
+        "intermediate": ["Smart Irrigation System with Soil Moisture", "Automatic Curtain Controller with Light Sensor"],
+        "advanced": ["Complete Home Automation with Mobile Control", "Smart Door Lock with RFID and Keypad"],
+        "expert": ["Voice Controlled Home with Multiple Zones", "AI-based Energy Management System"]
+    },
+    "sensors": {
+        "beginner": ["Multi-Sensor Data Logger to SD Card", "Room Environment Monitor with OLED Display"],
+        "intermediate": ["Air Quality Monitoring Station with Alerts", "Weather Station with Wireless Data Upload"],
+        "advanced": ["Portable Environmental Analysis Kit", "Industrial Gas Leak Detection System"],
+        "expert": ["Distributed Sensor Network with Edge Computing", "AI-Powered Predictive Maintenance System"]
+    }
+}
+
+
+def build_project_components(config: dict, skill_level_lower: str) -> List[str]:
+    """Base kit for the project type plus skill-level specific enhancements"""
+    components = config["components_base"].copy()
+
+    # Add skill-level specific enhancements
+    if skill_level_lower in ["intermediate", "advanced", "expert"]:
+        components.extend([
+            "0.96\" OLED Display I2C (128x64) for better UI",
+            "Buzzer Module for audio feedback"
+        ])
+    if skill_level_lower in ["advanced", "expert"]:
+        components.extend([
+            "nRF24L01+ Wireless Module for long-range communication",
+            "HC-05 Bluetooth Module for mobile connectivity"
+        ])
+    if skill_level_lower == "expert":
+        components.extend([
+            "Custom PCB design and fabrication",
+            "3D Printed Enclosure with CAD design",
+            "Mobile App development (MIT App Inventor / Flutter)"
+        ])
+    return components
+
+# ----- COHORT ASSIGNMENT -----
+SKILL_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+LOCAL_SEARCH_PASSES = 3
+
+_QUANTITY_PREFIX = re.compile(r"^(\d+)x\s+", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"and", "for", "the", "with", "using", "via", "based", "system", "project", "projects"}
+
+
+def interest_keywords(text: str) -> frozenset:
+    return frozenset(w for w in _WORD.findall(text.lower()) if len(w) > 2 and w not in _STOPWORDS)
+
+
+class ProjectTemplate(NamedTuple):
+    project_type: str
+    skill_level: str
+    title: str
+    components: List[str]
+    title_keywords: frozenset
+    topic_keywords: frozenset
+
+
+def build_project_templates() -> List[ProjectTemplate]:
+    """Every (type, skill level, title) combination generate_project can produce"""
+    templates = []
+    for project_type, titles_by_level in PROJECT_TITLES.items():
+        config = PROJECT_CONFIGS[project_type]
+        topic = " ".join([project_type] + config["components_base"] + config["skills_base"])
+        for skill_level in SKILL_LEVELS:
+            components = build_project_components(config, skill_level)
+            for title in titles_by_level[skill_level]:
+                templates.append(ProjectTemplate(
+                    project_type, skill_level, title, components,
+                    interest_keywords(title), interest_keywords(topic),
+                ))
+    return templates
+
+
+PROJECT_TEMPLATES = build_project_templates()
+
+
+def kit_requirements(
+    components: List[str], inventory: Dict[str, int], component_map: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Units of each inventory item a kit consumes, plus the kit components the
+    inventory does not cover. component_map pins a kit component to an
+    inventory name; otherwise a component matches an inventory name exactly
+    or by prefix ("Arduino Uno R3" covers "Arduino Uno R3 (ATmega328P
+    Microcontroller)").
+    """
+    pinned = {component.lower().strip(): name for component, name in (component_map or {}).items()}
+    names = sorted(inventory, key=len, reverse=True)
+    lowered = [(name, name.lower().strip()) for name in names if name.strip()]
+    needs: Dict[str, int] = {}
+    untracked: List[str] = []
+    for component in components:
+        quantity = 1
+        part = component
+        match = _QUANTITY_PREFIX.match(component)
+        if match:
+            quantity = int(match.group(1))
+            part = component[match.end():]
+        part = part.lower().strip()
+
+        target = pinned.get(component.lower().strip()) or pinned.get(part)
+        if target is None:
+            for name, key in lowered:
+                if part == key or (part.startswith(key) and part[len(key)] in " (/,"):
+                    target = name
+                    break
+        if target is None:
+            untracked.append(component)
+            continue
+        needs[target] = needs.get(target, 0) + quantity
+    return needs, untracked
+
+
+class CohortSolver:
+    """
+    Assigns one project template per student without exceeding lab stock.
+
+    Candidates are ranked lexicographically: first by how many skill levels
+    a student is moved down to fit the stock, then by how loaded the title
+    already is relative to its fair share of the cohort, and only then by
+    interest match. Titles that share a kit are therefore spread evenly, and
+    interests decide which student gets which of them.
+
+    A lazy greedy over a heap of templates builds the assignment (rankings
+    only worsen as titles fill up and stock runs out, so a re-ranked entry
+    that still tops the heap is the true best). The greedy is blind to who
+    needs a scarce kit most, so local search then pushes the holder of a
+    contested kit down when that lets a student who fell further move up,
+    relocates single students, and re-sorts students between titles that
+    share a kit.
+    """
+
+    def __init__(
+        self, students: List[CohortStudent], inventory: Dict[str, int],
+        component_map: Optional[Dict[str, str]] = None,
+    ):
+        self.students = students
+        self.inventory = inventory
+        self.stock = dict(inventory)
+        self.templates = PROJECT_TEMPLATES
+        kits = [kit_requirements(t.components, inventory, component_map) for t in self.templates]
+        self.needs = [needs for needs, _ in kits]
+        self.untracked = [untracked for _, untracked in kits]
+        self.feasible = [self._fits(c) for c in range(len(self.templates))]
+        self.counts = [0] * len(self.templates)
+
+        self.users_of: Dict[str, List[int]] = {}
+        self.max_need: Dict[str, int] = {}
+        for c, needs in enumerate(self.needs):
+            for name, units in needs.items():
+                self.users_of.setdefault(name, []).append(c)
+                self.max_need[name] = max(self.max_need.get(name, 0), units)
+
+        index = {(t.project_type, t.skill_level): [] for t in self.templates}
+        for c, t in enumerate(self.templates):
+            index[(t.project_type, t.skill_level)].append(c)
+        self.group_index = index
+
+        # Students with the same type, level and interests share one option list
+        profiles: Dict[tuple, int] = {}
+        self.options: List[List[Tuple[int, int, float]]] = []
+        self.option_of: List[Dict[int, Tuple[int, float]]] = []
+        self.request_of: List[tuple] = []
+        self.profile_of: List[int] = []
+        demand = [0.0] * len(self.templates)
+        for student in students:
+            key = self._profile_key(student.params)
+            profile = profiles.get(key)
+            if profile is None:
+                profile = profiles[key] = len(self.options)
+                options = self._build_options(*key)
+                self.options.append(options)
+                self.option_of.append({c: (down, interest) for c, down, interest in options})
+                self.request_of.append(key[:2])
+            self.profile_of.append(profile)
+            primary = index[(key[0], key[1])]
+            for c in primary:
+                demand[c] += 1.0 / len(primary)
+        self.share = [max(1.0, d) for d in demand]
+        self.choice: List[Optional[int]] = [None] * len(students)
+
+    @staticmethod
+    def _profile_key(params: ProjectParams) -> tuple:
+        project_type = params.projectType.lower()
+        if project_type not in PROJECT_TITLES:
+            project_type = "electronics"
+        skill_level = params.skillLevel.lower()
+        if skill_level not in SKILL_LEVELS:
+            skill_level = "beginner"
+        return project_type, skill_level, interest_keywords(params.interests)
+
+    def _build_options(self, project_type: str, skill_level: str, interests: frozenset) -> List[Tuple[int, int, float]]:
+        options = []
+        top = SKILL_LEVELS.index(skill_level)
+        for level in range(top, -1, -1):
+            for c in self.group_index[(project_type, SKILL_LEVELS[level])]:
+                options.append((c, top - level, self._interest(interests, c)))
+        return options
+
+    def _interest(self, interests: frozenset, c: int) -> float:
+        if not interests:
+            return 0.0
+        t = self.templates[c]
+        hits = len(interests & t.title_keywords) + 0.5 * len(interests & t.topic_keywords)
+        return min(1.0, hits / len(interests))
+
+    def _fits(self, c: int, released: Optional[int] = None) -> bool:
+        freed = self.needs[released] if released is not None else {}
+        return all(self.stock[name] + freed.get(name, 0) >= units for name, units in self.needs[c].items())
+
+    def _load(self, c: int, count: int) -> float:
+        """Growth of sum(count^2 / share) when a title holding `count` gains one student"""
+        return (2 * count + 1) / self.share[c]
+
+    def _take(self, i: int, c: int) -> None:
+        self.choice[i] = c
+        self.counts[c] += 1
+        self._adjust_stock(c, -1)
+
+    def _release(self, i: int) -> None:
+        c = self.choice[i]
+        self.choice[i] = None
+        self.counts[c] -= 1
+        self._adjust_stock(c, 1)
+
+    def _adjust_stock(self, c: int, sign: int) -> None:
+        for name, units in self.needs[c].items():
+            before = self.stock[name]
+            self.stock[name] = before + sign * units
+            # Feasibility only changes while an item is within one kit of running out
+            if min(before, self.stock[name]) < self.max_need[name]:
+                for other in self.users_of[name]:
+                    self.feasible[other] = self._fits(other)
+
+    def _greedy(self) -> None:
+        # Unassigned students per profile, and per template a heap of the
+        # profiles that can take it, best (downgrade, interest) first
+        waiting: List[List[int]] = [[] for _ in self.options]
+        for i in reversed(range(len(self.students))):
+            waiting[self.profile_of[i]].append(i)
+        takers: List[list] = [[] for _ in self.templates]
+        for profile, options in enumerate(self.options):
+            for c, down, interest in options:
+                takers[c].append((down, -interest, profile))
+        for heap in takers:
+            heapq.heapify(heap)
+
+        def rank(c: int) -> Optional[tuple]:
+            heap = takers[c]
+            while heap and not waiting[heap[0][2]]:
+                heapq.heappop(heap)
+            if not heap or not self.feasible[c]:
+                return None
+            down, neg_interest, _ = heap[0]
+            return down, self._load(c, self.counts[c]), neg_interest
+
+        titles = [(r, c) for c in range(len(self.templates)) if (r := rank(c)) is not None]
+        heapq.heapify(titles)
+        while titles:
+            _, c = heapq.heappop(titles)
+            r = rank(c)
+            if r is None:
+                continue
+            if titles and (r, c) > titles[0]:
+                heapq.heappush(titles, (r, c))
+                continue
+            self._take(waiting[takers[c][0][2]].pop(), c)
+            r = rank(c)
+            if r is not None:
+                heapq.heappush(titles, (r, c))
+
+    def _relocate(self) -> bool:
+        improved = False
+        for i, current in enumerate(self.choice):
+            option_of = self.option_of[self.profile_of[i]]
+            if current is None:
+                baseline = None
+            else:
+                down, interest = option_of[current]
+                baseline = (down, -self._load(current, self.counts[current] - 1), -interest)
+
+            best, best_rank = None, None
+            for c, down, interest in self.options[self.profile_of[i]]:
+                if c == current:
+                    continue
+                # Change in (downgrade, load, -interest) if student i moves to c
+                r = (down, self._load(c, self.counts[c]), -interest)
+                if baseline is not None:
+                    r = tuple(round(x + y, 9) for x, y in zip(r, baseline))
+                    if r >= (0, 0.0, 0.0):
+                        continue
+                if best_rank is not None and r >= best_rank:
+                    continue
+                if self.feasible[c] or (current is not None and self._fits(c, released=current)):
+                    best, best_rank = c, r
+            if best is not None:
+                if current is not None:
+                    self._release(i)
+                self._take(i, best)
+                improved = True
+        return improved
+
+    def _fits_exchange(self, takes: Tuple[int, int], releases: Tuple[Optional[int], int]) -> bool:
+        freed: Dict[str, int] = {}
+        for c in releases:
+            if c is not None:
+                for name, units in self.needs[c].items():
+                    freed[name] = freed.get(name, 0) + units
+        wanted: Dict[str, int] = {}
+        for c in takes:
+            for name, units in self.needs[c].items():
+                wanted[name] = wanted.get(name, 0) + units
+        return all(self.stock[name] + freed.get(name, 0) >= units for name, units in wanted.items())
+
+    def _eject(self) -> bool:
+        """
+        Two-student moves that lower the total downgrade: student i takes
+        template c, and a student j holding a kit that competes with c for
+        stock falls back to another of its options. Unassigned students
+        count as one level below the lowest level.
+        """
+        # Students who asked for the same type and level have the same
+        # fallbacks, so holders are grouped by kit and then by request
+        holders: Dict[int, Dict[tuple, Set[int]]] = {}
+
+        def hold(j: int, c: int) -> None:
+            holders.setdefault(c, {}).setdefault(self.request_of[self.profile_of[j]], set()).add(j)
+
+        def drop(j: int, c: int) -> None:
+            group = holders[c][self.request_of[self.profile_of[j]]]
+            group.discard(j)
+            if not group:
+                del holders[c][self.request_of[self.profile_of[j]]]
+
+        for j, c in enumerate(self.choice):
+            if c is not None:
+                hold(j, c)
+
+        unassigned_down = len(SKILL_LEVELS)
+        failed: Set[tuple] = set()
+        improved = False
+        for i in range(len(self.students)):
+            current = self.choice[i]
+            profile = self.profile_of[i]
+            current_down = unassigned_down if current is None else self.option_of[profile][current][0]
+            for c, down, _ in self.options[profile]:
+                if down >= current_down:
+                    break
+                key = (current, c, current_down - down)
+                if key in failed:
+                    continue
+                move = self._find_ejection(i, c, current_down - down, holders)
+                if move is None:
+                    failed.add(key)
+                    continue
+                j, held, fallback = move
+                if current is not None:
+                    self._release(i)
+                    drop(i, current)
+                self._release(j)
+                drop(j, held)
+                self._take(i, c)
+                self._take(j, fallback)
+                hold(i, c)
+                hold(j, fallback)
+                improved = True
+                break
+        return improved
+
+    def _find_ejection(
+        self, i: int, c: int, gain: int, holders: Dict[int, Dict[tuple, Set[int]]]
+    ) -> Optional[Tuple[int, int, int]]:
+        """A student j, the kit it holds and a fallback costing fewer than `gain` extra levels"""
+        current = self.choice[i]
+        freed = self.needs[current] if current is not None else {}
+        short = [name for name, units in self.needs[c].items()
+                 if self.stock[name] + freed.get(name, 0) < units]
+        contested = {other for name in short for other in self.users_of[name]}
+        for held in contested:
+            for group in holders.get(held, {}).values():
+                j = next((j for j in group if j != i), None)
+                if j is None:
+                    continue
+                profile = self.profile_of[j]
+                held_down = self.option_of[profile][held][0]
+                for fallback, down, _ in self.options[profile]:
+                    if fallback == held or down - held_down >= gain:
+                        continue
+                    if self._fits_exchange((c, fallback), (current, held)):
+                        return j, held, fallback
+        return None
+
+    def _swap_pairs(self) -> bool:
+        """
+        Re-sort students between titles where trading leaves stock, title
+        counts and downgrades unchanged: titles sharing a kit, and any titles
+        held by students who asked for the same type and level.
+        """
+        kit_pools: Dict[tuple, List[int]] = {}
+        request_pools: Dict[tuple, List[int]] = {}
+        for i, c in enumerate(self.choice):
+            if c is None:
+                continue
+            t = self.templates[c]
+            kit_pools.setdefault((t.project_type, t.skill_level), []).append(i)
+            request_pools.setdefault(self.request_of[self.profile_of[i]], []).append(i)
+
+        improved = False
+        for pool in list(kit_pools.values()) + list(request_pools.values()):
+            members: Dict[int, List[int]] = {}
+            for i in pool:
+                members.setdefault(self.choice[i], []).append(i)
+            titles = sorted(members)
+            for x in range(len(titles)):
+                for y in range(x + 1, len(titles)):
+                    improved |= self._resort(titles[x], titles[y], members)
+        return improved
+
+    def _resort(self, a: int, b: int, members: Dict[int, List[int]]) -> bool:
+        """Give title b to the students who gain most from it over title a"""
+        pool = members[a] + members[b]
+        gain = {}
+        for i in pool:
+            option_of = self.option_of[self.profile_of[i]]
+            gain[i] = option_of[b][1] - option_of[a][1]
+        current = sum(gain[i] for i in members[b])
+        pool.sort(key=gain.__getitem__, reverse=True)
+        split = len(members[b])
+        if sum(gain[i] for i in pool[:split]) <= current + 1e-9:
+            return False
+        members[b], members[a] = pool[:split], pool[split:]
+        for i in members[b]:
+            self.choice[i] = b
+        for i in members[a]:
+            self.choice[i] = a
+        return True
+
+    def solve(self) -> CohortAssignmentResult:
+        self._greedy()
+        for _ in range(LOCAL_SEARCH_PASSES):
+            ejected = self._eject()
+            moved = self._relocate()
+            swapped = self._swap_pairs()
+            if not (ejected or moved or swapped):
+                break
+
+        assignments = []
+        unassigned = []
+        for i, student in enumerate(self.students):
+            c = self.choice[i]
+            if c is None:
+                unassigned.append(student.student_id)
+                assignments.append(CohortAssignment(
+                    student_id=student.student_id,
+                    projectType=student.params.projectType,
+                    difficulty=student.params.skillLevel,
+                ))
+                continue
+            t = self.templates[c]
+            assignments.append(CohortAssignment(
+                student_id=student.student_id,
+                title=t.title,
+                projectType=t.project_type,
+                difficulty=t.skill_level,
+                components=t.components,
+                interestScore=round(self.option_of[self.profile_of[i]][c][1], 3),
+            ))
+
+        used = [c for c, count in enumerate(self.counts) if count]
+        matched = {name for needs in self.needs for name in needs}
+        return CohortAssignmentResult(
+            assignments=assignments,
+            unassigned=unassigned,
+            distinctTitles=len(used),
+            remainingStock=self.stock,
+            untrackedComponents=sorted({component for c in used for component in self.untracked[c]}),
+            unmatchedInventory=sorted(name for name in self.inventory if name not in matched),
+        )
+
 # ----- ROUTES -----
 @api_router.get("/")
 async def root():
@@ -88,7 +1086,7 @@ async def get_status_checks():
     return status_checks
 
 @api_router.post("/generate-project", response_model=GeneratedProject)
-async def generate_project(params: ProjectParams):
+async def generate_project(params: ProjectParams, request: Request):
     """
     Generate ATAL-focused STEM project based on user parameters
     
@@ -98,192 +1096,13 @@ async def generate_project(params: ProjectParams):
     try:
         logger.info(f"Generating project for: {params.projectType}, skill: {params.skillLevel}")
         
-        # Enhanced project configurations with ATAL components
-        project_configs = {
-            "robotics": {
-                "components_base": [
-                    "Arduino Uno R3 (ATmega328P Microcontroller)",
-                    "L298N Motor Driver Module (Dual H-Bridge)",
-                    "2x BO DC Geared Motors with Wheels (60-200 RPM)",
-                    "2WD Robot Chassis (Acrylic with Battery Holder)",
-                    "HC-SR04 Ultrasonic Sensor (2-400cm range)",
-                    "4xAA Battery Holder with ON/OFF Switch",
-                    "Jumper Wires (Male-Male, Male-Female)",
-                    "Mini Breadboard 400 points"
-                ],
-                "skills_base": [
-                    "Arduino programming basics (C/C++)",
-                    "PWM (Pulse Width Modulation) for motor speed control",
-                    "Ultrasonic sensor interfacing and distance measurement",
-                    "H-Bridge motor driver operation and direction control",
-                    "Robot kinematics and movement logic",
-                    "Power management for mobile robots"
-                ],
-                "cost_range": {"beginner": "₹800-1200", "intermediate": "₹1200-2000", "advanced": "₹2000-3500", "expert": "₹3500-6000"},
-                "learning_outcomes": [
-                    "Understand basics of mobile robotics and actuation",
-                    "Learn motor control using PWM signals",
-                    "Master sensor integration for autonomous behavior",
-                    "Develop problem-solving skills through robot debugging"
-                ]
-            },
-            "iot": {
-                "components_base": [
-                    "ESP32 DevKit (Dual-core WiFi + Bluetooth)",
-                    "DHT22 Temperature & Humidity Sensor (High precision)",
-                    "BMP280 Barometric Pressure Sensor (I2C)",
-                    "0.96\" OLED Display 128x64 (I2C Interface)",
-                    "Mini Breadboard with Jumper Wires",
-                    "5V 2A Power Adapter or USB Cable",
-                    "Micro USB Cable for Programming"
-                ],
-                "skills_base": [
-                    "ESP32 programming with Arduino IDE/MicroPython",
-                    "WiFi connectivity and HTTP requests",
-                    "I2C communication protocol",
-                    "IoT platforms (ThingSpeak, Blynk, Firebase)",
-                    "Data visualization and cloud integration",
-                    "Sensor data processing and filtering"
-                ],
-                "cost_range": {"beginner": "₹600-1000", "intermediate": "₹1000-1800", "advanced": "₹1800-3000", "expert": "₹3000-5000"},
-                "learning_outcomes": [
-                    "Master wireless communication protocols",
-                    "Learn cloud-based data storage and retrieval",
-                    "Understand IoT architecture and data flow",
-                    "Create web dashboards for monitoring"
-                ]
-            },
-            "electronics": {
-                "components_base": [
-                    "Arduino Nano (Compact ATmega328P board)",
-                    "Resistor Kit (10Ω to 1MΩ, 1/4W, ±5%)",
-                    "LED Assortment (5mm - Red, Green, Blue, Yellow, White)",
-                    "Ceramic Capacitor Kit (10pF to 100nF)",
-                    "2N2222 NPN Transistors (for switching)",
-                    "1N4007 Diodes (Rectifier, 1000V 1A)",
-                    "Solderless Breadboard 830 points",
-                    "Digital Multimeter for measurements"
-                ],
-                "skills_base": [
-                    "Basic circuit analysis (Ohm's Law, Kirchhoff's Laws)",
-                    "LED current limiting resistor calculation",
-                    "Transistor as switch and amplifier",
-                    "Capacitor charging/discharging characteristics",
-                    "PCB design fundamentals",
-                    "Soldering techniques and practices"
-                ],
-                "cost_range": {"beginner": "₹500-900", "intermediate": "₹900-1500", "advanced": "₹1500-2500", "expert": "₹2500-4000"},
-                "learning_outcomes": [
-                    "Build strong foundation in analog electronics",
-                    "Master breadboard prototyping techniques",
-                    "Learn to read and create circuit diagrams",
-                    "Develop systematic troubleshooting skills"
-                ]
-            },
-            "automation": {
-                "components_base": [
-                    "Arduino Uno R3 / ESP32 (for WiFi control)",
-                    "4-Channel 5V Relay Module (10A 250V AC rating)",
-                    "PIR Motion Sensor HC-SR501 (7m range, 120° angle)",
-                    "LDR (Light Dependent Resistor) with 10kΩ resistor",
-                    "DHT11 Temperature & Humidity Sensor",
-                    "16x2 LCD Display with I2C Module",
-                    "5V 2A Power Supply",
-                    "Connecting Wires and Terminal Blocks"
-                ],
-                "skills_base": [
-                    "Relay control and isolation techniques",
-                    "Sensor-based decision making logic",
-                    "Interrupt handling for motion detection",
-                    "Home automation protocols",
-                    "Safety considerations for AC appliances",
-                    "Timer and scheduling implementations"
-                ],
-                "cost_range": {"beginner": "₹700-1200", "intermediate": "₹1200-2000", "advanced": "₹2000-3500", "expert": "₹3500-5500"},
-                "learning_outcomes": [
-                    "Understand home automation systems",
-                    "Learn safe AC appliance control",
-                    "Master sensor fusion for smart decisions",
-                    "Create practical IoT automation solutions"
-                ]
-            },
-            "sensors": {
-                "components_base": [
-                    "Arduino Uno R3 (Microcontroller)",
-                    "DHT22 (Temp & Humidity - High accuracy)",
-                    "MQ-135 Air Quality Sensor (NH3, NOx, CO2)",
-                    "BH1750 Digital Light Sensor (I2C, 1-65535 lux)",
-                    "20x4 LCD Display with I2C",
-                    "MicroSD Card Module (for data logging)",
-                    "DS3231 RTC Module (±2ppm accuracy)",
-                    "Breadboard and Connecting Wires"
-                ],
-                "skills_base": [
-                    "Multi-sensor integration and management",
-                    "I2C bus communication and addressing",
-                    "Data logging to SD card (CSV format)",
-                    "Real-time clock for timestamping",
-                    "Sensor calibration techniques",
-                    "Data visualization using Serial Plotter"
-                ],
-                "cost_range": {"beginner": "₹800-1400", "intermediate": "₹1400-2200", "advanced": "₹2200-3500", "expert": "₹3500-5500"},
-                "learning_outcomes": [
-                    "Master sensor interfacing techniques",
-                    "Learn data acquisition and logging",
-                    "Understand environmental monitoring systems",
-                    "Develop data analysis skills"
-                ]
-            }
-        }
-        
         # Get configuration for project type (default to electronics if not found)
-        config = project_configs.get(params.projectType.lower(), project_configs["electronics"])
+        config = PROJECT_CONFIGS.get(params.projectType.lower(), PROJECT_CONFIGS["electronics"])
         
-        # Skill level adjustments
         skill_level_lower = params.skillLevel.lower()
-        time_estimates = {
-            "beginner": "1-2 weeks (8-15 hours total)",
-            "intermediate": "2-4 weeks (20-35 hours total)", 
-            "advanced": "4-8 weeks (40-70 hours total)",
-            "expert": "8-12 weeks (80-120 hours total)"
-        }
-        
-        # Enhanced project titles with real-world applications
-        project_titles = {
-            "robotics": {
-                "beginner": ["Line Following Robot for Warehouse Navigation", "Obstacle Avoiding Car with Ultrasonic Sensors"],
-                "intermediate": ["Bluetooth Controlled Robot with Mobile App", "Gesture Controlled Robot using Accelerometer"],
-                "advanced": ["Autonomous Maze Solving Robot with Wall Following", "Voice Controlled Robotic Arm with Inverse Kinematics"],
-                "expert": ["SLAM-based Mapping Robot with ROS", "Quadruped Walking Robot with Servo Control"]
-            },
-            "iot": {
-                "beginner": ["WiFi Weather Station with Web Dashboard", "Smart Plant Monitoring System with Alerts"],
-                "intermediate": ["IoT Home Security System with Mobile Notifications", "Remote Controlled Appliances via Blynk App"],
-                "advanced": ["Multi-Room Environmental Monitoring Network", "Smart Energy Meter with Power Analytics"],
-                "expert": ["Complete Smart Home System with Voice Control", "Industrial IoT Sensor Network with MQTT"]
-            },
-            "electronics": {
-                "beginner": ["LED Chaser with 555 Timer IC", "Temperature Indicator using LM35 and LEDs"],
-                "intermediate": ["Digital Voltmeter with LCD Display", "Automatic Night Light using LDR and Transistor"],
-                "advanced": ["Function Generator with Multiple Waveforms", "Battery Capacity Tester with Data Logging"],
-                "expert": ["Digital Oscilloscope using Arduino", "Impedance Analyzer for Component Testing"]
-            },
-            "automation": {
-                "beginner": ["Automatic Room Light using PIR Sensor", "Temperature Controlled Fan with LCD"],
-                "intermediate": ["Smart Irrigation System with Soil Moisture", "Automatic Curtain Controller with Light Sensor"],
-                "advanced": ["Complete Home Automation with Mobile Control", "Smart Door Lock with RFID and Keypad"],
-                "expert": ["Voice Controlled Home with Multiple Zones", "AI-based Energy Management System"]
-            },
-            "sensors": {
-                "beginner": ["Multi-Sensor Data Logger to SD Card", "Room Environment Monitor with OLED Display"],
-                "intermediate": ["Air Quality Monitoring Station with Alerts", "Weather Station with Wireless Data Upload"],
-                "advanced": ["Portable Environmental Analysis Kit", "Industrial Gas Leak Detection System"],
-                "expert": ["Distributed Sensor Network with Edge Computing", "AI-Powered Predictive Maintenance System"]
-            }
-        }
         
         # Select appropriate title based on skill level
-        titles = project_titles.get(params.projectType.lower(), project_titles["electronics"])
+        titles = PROJECT_TITLES.get(params.projectType.lower(), PROJECT_TITLES["electronics"])
         if isinstance(titles, dict):
             project_title = random.choice(titles.get(skill_level_lower, titles["beginner"]))
         else:
@@ -297,25 +1116,7 @@ async def generate_project(params: ProjectParams):
         description += f"You'll gain practical experience with real-world components and develop problem-solving skills through iterative building and testing."
         
         # Build comprehensive components list with specifications
-        components = config["components_base"].copy()
-        
-        # Add skill-level specific enhancements
-        if skill_level_lower in ["intermediate", "advanced", "expert"]:
-            components.extend([
-                "0.96\" OLED Display I2C (128x64) for better UI",
-                "Buzzer Module for audio feedback"
-            ])
-        if skill_level_lower in ["advanced", "expert"]:
-            components.extend([
-                "nRF24L01+ Wireless Module for long-range communication",
-                "HC-05 Bluetooth Module for mobile connectivity"
-            ])
-        if skill_level_lower == "expert":
-            components.extend([
-                "Custom PCB design and fabrication",
-                "3D Printed Enclosure with CAD design",
-                "Mobile App development (MIT App Inventor / Flutter)"
-            ])
+        components = build_project_components(config, skill_level_lower)
         
         # Enhanced skills with detailed learning points
         skills = config["skills_base"].copy()
@@ -371,7 +1172,7 @@ async def generate_project(params: ProjectParams):
         cost = params.budget if params.budget else config["cost_range"].get(skill_level_lower, "₹1000-1500")
         
         # Determine time with detailed breakdown
-        time = params.duration if params.duration else time_estimates.get(skill_level_lower, "2-3 weeks (25 hours)")
+        time = params.duration if params.duration else TIME_ESTIMATES.get(skill_level_lower, "2-3 weeks (25 hours)")
         
         # Create project with enhanced data
         project = GeneratedProject(
@@ -385,6 +1186,18 @@ async def generate_project(params: ProjectParams):
             steps=steps
         )
         
+        # Without personalization the body depends only on these inputs, so
+        # its compressed variants can be cached by CompressionMiddleware. The
+        # body echoes the raw strings, so only exact canonical spellings keep
+        # the key space finite; anything else takes the fast path.
+        is_template = (
+            params.projectType in PROJECT_TITLES
+            and params.skillLevel in TIME_ESTIMATES
+            and not (params.interests or params.budget or params.duration)
+        )
+        if is_template:
+            setattr(request.state, COMPRESSION_KEY, (params.projectType, params.skillLevel, project_title))
+
         logger.info(f"Generated ATAL project: {project.title}")
         return project
         
@@ -392,6 +1205,44 @@ async def generate_project(params: ProjectParams):
         logger.error(f"Error generating project: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Project generation failed: {str(e)}")
 
+@api_router.post("/cohorts/assign", response_model=CohortAssignmentResult)
+async def assign_cohort_projects(request: CohortRequest):
+    """
+    Assign distinct projects to a whole class within the lab's inventory
+
+    Each student gets a project for their type and skill level (or a lower
+    level when the full kit is out of stock). Titles that share a kit are
+    spread evenly across the class, and interests decide who gets which.
+    Kit components that match no inventory name (use componentMap to pin
+    them) are not stock-limited and are listed in untrackedComponents.
+    """
+    negative = [name for name, units in request.inventory.items() if units < 0]
+    if negative:
+        raise HTTPException(status_code=400, detail=f"Negative stock for: {', '.join(negative)}")
+
+    unknown = sorted({name for name in request.componentMap.values() if name not in request.inventory})
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"componentMap targets not in inventory: {', '.join(unknown)}")
+
+    try:
+        # CPU-bound for large classes; keep it off the event loop so SSE
+        # streams and other requests stay responsive
+        def solve() -> CohortAssignmentResult:
+            return CohortSolver(request.students, request.inventory, request.componentMap).solve()
+
+        result = await run_in_threadpool(solve)
+        logger.info(
+            f"Assigned {len(request.students) - len(result.unassigned)}/{len(request.students)} students "
+            f"across {result.distinctTitles} titles"
+        )
+        if result.untrackedComponents:
+            logger.warning(f"Cohort kits use {len(result.untrackedComponents)} components missing from inventory")
+        return result
+
+    except Exception as e:
+        logger.error(f"Error assigning cohort projects: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Cohort assignment failed: {str(e)}")
+
 # ----- PROJECT ENDPOINTS -----
 @api_router.post("/projects/save")
 async def save_project(data: dict):
@@ -420,7 +1271,12 @@ async def save_project(data: dict):
 
         result = supabase.table("projects").insert(project_data).execute()
         logger.info(f"Project saved for user {user_id}")
-        return result.data[0] if result.data else {}
+        saved = result.data[0] if result.data else {}
+
+        if saved:
+            project_events.publish(user_id, "project-created", saved)
+            publish_project_stats(user_id)
+        return saved
 
     except Exception as e:
         logger.error(f"Error saving project: {str(e)}")
@@ -447,6 +1303,64 @@ async def get_user_projects(user_id: str, status: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
 
 
+@api_router.patch("/projects/{project_id}/status")
+async def update_project_status(project_id: str, update: ProjectStatusUpdate):
+    """Change a project's status and notify the owner's dashboard streams"""
+    try:
+        if not supabase:
+            raise HTTPException(status_code=503, detail="Supabase not configured")
+
+        if update.status not in PROJECT_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {update.status}")
+
+        result = (
+            supabase.table("projects")
+            .update({"status": update.status})
+            .eq("id", project_id)
+            .eq("user_id", update.user_id)
+            .execute()
+        )
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        project = result.data[0]
+        project_events.publish(update.user_id, "project-status-changed", {
+            "id": project_id,
+            "status": update.status,
+            "updated_at": project.get("updated_at"),
+        })
+        publish_project_stats(update.user_id)
+        return project
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating project status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating project status: {str(e)}")
+
+
+def compute_project_stats(user_id: str) -> dict:
+    result = supabase.table("projects").select("status").eq("user_id", user_id).execute()
+    projects = result.data or []
+
+    return {
+        "total": len(projects),
+        "completed": len([p for p in projects if p["status"] == "completed"]),
+        "in_progress": len([p for p in projects if p["status"] == "in-progress"]),
+        "planning": len([p for p in projects if p["status"] == "planning"]),
+    }
+
+
+def publish_project_stats(user_id: str) -> None:
+    """Push fresh stats to subscribed dashboards; failures never break the write path"""
+    if not project_events.has_subscribers(user_id):
+        return
+    try:
+        project_events.publish(user_id, "stats", compute_project_stats(user_id))
+    except Exception as e:
+        logger.warning(f"Could not publish stats for user {user_id}: {str(e)}")
+
+
 @api_router.get("/project-stats/{user_id}")
 async def get_project_stats(user_id: str):
     """Get project statistics for a user"""
@@ -454,22 +1368,57 @@ async def get_project_stats(user_id: str):
         if not supabase:
             raise HTTPException(status_code=503, detail="Supabase not configured")
 
-        result = supabase.table("projects").select("status").eq("user_id", user_id).execute()
-        projects = result.data or []
-
-        stats = {
-            "total": len(projects),
-            "completed": len([p for p in projects if p["status"] == "completed"]),
-            "in_progress": len([p for p in projects if p["status"] == "in-progress"]),
-            "planning": len([p for p in projects if p["status"] == "planning"]),
-        }
-
-        return stats
+        return compute_project_stats(user_id)
 
     except Exception as e:
         logger.error(f"Error fetching stats: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
+
+@api_router.get("/project-events/{user_id}")
+async def stream_project_events(user_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of project changes for a user's dashboard.
+
+    Emits `project-created`, `project-status-changed` and `stats` events.
+    Reconnecting clients send Last-Event-ID (EventSource does this
+    automatically) and receive any buffered events they missed, or a
+    `resync` event when those events are no longer available.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    queue = project_events.subscribe(user_id, resume_from)
+    logger.info(f"SSE client connected for user {user_id} ({project_events.subscriber_count()} open)")
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing idle connections
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield format_sse(*message)
+        finally:
+            project_events.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
 # Include router
 app.include_router(api_router)
 
@@ -487,6 +1436,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli/zstd for large JSON bodies
+app.add_middleware(CompressionMiddleware)
+
 # Logging setup
 logging.basicConfig(
     level=logging.INFO,
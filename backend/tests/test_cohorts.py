@@ -0,0 +1,160 @@
+import random
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+import server
+from server import (
+    PROJECT_TITLES,
+    SKILL_LEVELS,
+    CohortSolver,
+    CohortStudent,
+    ProjectParams,
+    kit_requirements,
+)
+
+client = TestClient(server.app)
+
+
+def student(n, project_type="robotics", skill_level="beginner", interests=""):
+    params = ProjectParams(projectType=project_type, skillLevel=skill_level, interests=interests)
+    return CohortStudent(student_id=f"s{n}", params=params)
+
+
+def stock_used(result, inventory):
+    used = Counter()
+    for assignment in result.assignments:
+        if assignment.title:
+            needs, _ = kit_requirements(assignment.components, inventory)
+            used.update(needs)
+    return used
+
+
+def test_kit_requirements_prefix_and_quantity():
+    needs, untracked = kit_requirements(
+        ["Arduino Uno R3 (ATmega328P Microcontroller)", "2x BO DC Geared Motors with Wheels (60-200 RPM)",
+         "4xAA Battery Holder with ON/OFF Switch"],
+        {"Arduino Uno R3": 5, "BO DC Geared Motors": 5, "Arduino": 5},
+    )
+
+    assert needs == {"Arduino Uno R3": 1, "BO DC Geared Motors": 2}
+    assert untracked == ["4xAA Battery Holder with ON/OFF Switch"]
+
+
+def test_kit_requirements_component_map():
+    needs, untracked = kit_requirements(
+        ["DHT22 Temperature & Humidity Sensor (High precision)", "2x BO DC Geared Motors with Wheels (60-200 RPM)"],
+        {"DHT22/AM2302 Sensor": 3, "DC Geared Motor with Wheel (BO Motor)": 10},
+        {
+            "DHT22 Temperature & Humidity Sensor (High precision)": "DHT22/AM2302 Sensor",
+            "BO DC Geared Motors with Wheels (60-200 RPM)": "DC Geared Motor with Wheel (BO Motor)",
+        },
+    )
+
+    assert needs == {"DHT22/AM2302 Sensor": 1, "DC Geared Motor with Wheel (BO Motor)": 2}
+    assert untracked == []
+
+
+def test_stock_is_never_exceeded():
+    rng = random.Random(7)
+    types = list(PROJECT_TITLES)
+    students = [student(n, rng.choice(types), rng.choice(SKILL_LEVELS), rng.choice(["", "robot", "weather"]))
+                for n in range(2000)]
+    inventory = {"Arduino Uno R3": 300, "ESP32 DevKit": 200, "HC-05 Bluetooth Module": 250,
+                 "L298N Motor Driver Module": 90, "BO DC Geared Motors": 120}
+
+    result = CohortSolver(students, inventory).solve()
+
+    used = stock_used(result, inventory)
+    for name, units in inventory.items():
+        assert used[name] <= units
+        assert result.remainingStock[name] == units - used[name]
+
+
+def test_downgrades_when_full_kit_is_out_of_stock():
+    students = [student(n, "iot", "advanced") for n in range(3)]
+
+    result = CohortSolver(students, {"HC-05 Bluetooth Module": 1}).solve()
+
+    assert sorted(a.difficulty for a in result.assignments) == ["advanced", "intermediate", "intermediate"]
+    assert result.unassigned == []
+
+
+def test_scarce_kit_goes_to_student_who_would_fall_furthest():
+    students = [student(0, "iot", "expert"), student(1, "iot", "advanced")]
+
+    result = CohortSolver(students, {"HC-05 Bluetooth Module": 1}).solve()
+
+    levels = {a.student_id: a.difficulty for a in result.assignments}
+    assert levels == {"s0": "expert", "s1": "intermediate"}
+
+
+def test_unassigned_when_nothing_fits():
+    students = [student(n, "robotics", "beginner") for n in range(3)]
+
+    result = CohortSolver(students, {"L298N Motor Driver Module": 2}).solve()
+
+    assert len(result.unassigned) == 1
+    assert sum(1 for a in result.assignments if a.title) == 2
+    assert result.remainingStock == {"L298N Motor Driver Module": 0}
+
+
+def test_identical_class_spreads_across_titles():
+    for size in (4, 10):
+        students = [student(n, interests="warehouse") for n in range(size)]
+
+        result = CohortSolver(students, {}).solve()
+
+        counts = Counter(a.title for a in result.assignments)
+        assert len(counts) == 2
+        assert max(counts.values()) - min(counts.values()) <= 1
+
+
+def test_interest_decides_who_gets_which_title():
+    students = [student(0, interests="maze"), student(1, interests="voice arm")]
+    for s in students:
+        s.params.skillLevel = "advanced"
+
+    result = CohortSolver(students, {}).solve()
+
+    titles = {a.student_id: a.title for a in result.assignments}
+    assert titles["s0"].startswith("Autonomous Maze")
+    assert titles["s1"].startswith("Voice Controlled Robotic Arm")
+
+
+def test_reports_untracked_components_and_unmatched_inventory():
+    result = CohortSolver([student(0)], {"Arduino Uno R3": 5, "Soldering Iron": 2}).solve()
+
+    assert "HC-SR04 Ultrasonic Sensor (2-400cm range)" in result.untrackedComponents
+    assert "Arduino Uno R3 (ATmega328P Microcontroller)" not in result.untrackedComponents
+    assert result.unmatchedInventory == ["Soldering Iron"]
+
+
+def test_endpoint_assigns_cohort():
+    response = client.post("/api/cohorts/assign", json={
+        "students": [{"student_id": f"s{n}", "params": {"projectType": "iot", "skillLevel": "beginner"}}
+                     for n in range(4)],
+        "inventory": {"ESP32 DevKit": 3},
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["unassigned"]) == 1
+    assert body["distinctTitles"] == 2
+    assert body["remainingStock"] == {"ESP32 DevKit": 0}
+
+
+def test_endpoint_rejects_negative_inventory():
+    response = client.post("/api/cohorts/assign", json={"students": [], "inventory": {"ESP32 DevKit": -1}})
+
+    assert response.status_code == 400
+
+
+def test_endpoint_rejects_unknown_component_map_target():
+    response = client.post("/api/cohorts/assign", json={
+        "students": [],
+        "inventory": {"ESP32 DevKit": 1},
+        "componentMap": {"ESP32 DevKit (Dual-core WiFi + Bluetooth)": "ESP32"},
+    })
+
+    assert response.status_code == 400
@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from server import CompressedVariantCache, CompressionMiddleware, negotiate_encoding
+
+
+@pytest.fixture
+def all_encodings(monkeypatch):
+    monkeypatch.setattr(server, "SUPPORTED_ENCODINGS", ["zstd", "br", "gzip"])
+
+
+def test_negotiate_prefers_server_order(all_encodings):
+    assert negotiate_encoding("gzip, deflate, br, zstd") == "zstd"
+    assert negotiate_encoding("gzip, br") == "br"
+
+
+def test_negotiate_respects_q_values(all_encodings):
+    assert negotiate_encoding("zstd;q=0.2, gzip;q=0.8") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+
+
+def test_negotiate_wildcard(all_encodings):
+    assert negotiate_encoding("*") == "zstd"
+    assert negotiate_encoding("gzip;q=0.5, *;q=0") == "gzip"
+    assert negotiate_encoding("zstd;q=0, *") == "br"
+
+
+def test_negotiate_unsupported(all_encodings):
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("deflate, compress") is None
+
+
+def test_negotiate_skips_missing_codecs(monkeypatch):
+    monkeypatch.setattr(server, "SUPPORTED_ENCODINGS", ["gzip"])
+    assert negotiate_encoding("br, zstd") is None
+    assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+
+
+def run_middleware(body, content_type=b"application/json", accept=b"gzip", extra_headers=(), chunks=1, state=None):
+    async def app(scope, receive, send):
+        if state:
+            scope["state"].update(state)
+        headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers + list(extra_headers)})
+        size = len(body) // chunks
+        for n in range(chunks):
+            part = body[n * size:] if n == chunks - 1 else body[n * size:(n + 1) * size]
+            await send({"type": "http.response.body", "body": part, "more_body": n < chunks - 1})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/api/test", "headers": [(b"accept-encoding", accept)]}
+    asyncio.run(CompressionMiddleware(app)(scope, None, send))
+    return dict(sent[0]["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_middleware_compresses_above_threshold():
+    body = b'{"steps": "' + b"x" * 4000 + b'"}'
+
+    headers, sent = run_middleware(body, chunks=3)
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(sent)).encode()
+    assert gzip.decompress(sent) == body
+
+
+def test_middleware_skips_small_bodies():
+    headers, sent = run_middleware(b'{"message": "Hello World"}')
+
+    assert b"content-encoding" not in headers
+    assert sent == b'{"message": "Hello World"}'
+
+
+def test_middleware_merges_vary():
+    headers, _ = run_middleware(b"x" * 2000, extra_headers=[(b"vary", b"Origin")])
+
+    assert headers[b"vary"] == b"Origin, Accept-Encoding"
+
+
+def test_middleware_passes_event_streams_through():
+    body = b"data: " + b"x" * 4000 + b"\n\n"
+
+    headers, sent = run_middleware(body, content_type=b"text/event-stream", chunks=2)
+
+    assert b"content-encoding" not in headers
+    assert sent == body
+
+
+def test_middleware_passes_through_without_accept_encoding():
+    headers, sent = run_middleware(b"x" * 2000, accept=b"identity")
+
+    assert b"content-encoding" not in headers
+    assert sent == b"x" * 2000
+
+
+def test_middleware_caches_only_flagged_bodies(monkeypatch):
+    cache = CompressedVariantCache()
+    monkeypatch.setattr(server, "compressed_variants", cache)
+    body = b"y" * 2000
+
+    run_middleware(body)
+    assert cache.misses == 0
+
+    run_middleware(body, state={server.COMPRESSION_KEY: ("iot", "beginner", "title")})
+    run_middleware(body, state={server.COMPRESSION_KEY: ("iot", "beginner", "title")})
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_generate_project_caches_templates_not_personalized(monkeypatch):
+    cache = CompressedVariantCache()
+    monkeypatch.setattr(server, "compressed_variants", cache)
+    client = TestClient(server.app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    for interests in ["robots", "weather", "music"]:
+        response = client.post("/api/generate-project", headers=headers,
+                               json={"projectType": "iot", "skillLevel": "expert", "interests": interests})
+        assert response.headers["content-encoding"] == "gzip"
+    assert cache.misses == 0
+
+    for _ in range(6):
+        client.post("/api/generate-project", headers=headers, json={"projectType": "iot", "skillLevel": "expert"})
+    assert cache.misses <= 2
+    assert cache.hits + cache.misses == 6
+
+
+def test_generate_project_non_canonical_inputs_skip_cache(monkeypatch):
+    calls = []
+
+    class RecordingCache(CompressedVariantCache):
+        def get(self, template_key, body, encoding):
+            calls.append(template_key)
+            return super().get(template_key, body, encoding)
+
+    monkeypatch.setattr(server, "compressed_variants", RecordingCache())
+    client = TestClient(server.app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    for params in [{"projectType": "IoT", "skillLevel": "expert"},
+                   {"projectType": "t42", "skillLevel": "expert"},
+                   {"projectType": "iot", "skillLevel": "Expert"}]:
+        response = client.post("/api/generate-project", headers=headers, json=params)
+        assert response.headers["content-encoding"] == "gzip"
+    assert calls == []
+
+    client.post("/api/generate-project", headers=headers, json={"projectType": "iot", "skillLevel": "expert"})
+    assert len(calls) == 1
@@ -0,0 +1,123 @@
+import asyncio
+
+from server import SUBSCRIBER_QUEUE_SIZE, ProjectEventBroker, format_sse
+
+
+def drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def test_publish_reaches_only_that_users_subscribers():
+    broker = ProjectEventBroker()
+    mine = broker.subscribe("u1")
+    other = broker.subscribe("u2")
+
+    event_id = broker.publish("u1", "project-created", {"id": "p1"})
+
+    assert drain(mine) == [(event_id, "project-created", {"id": "p1"})]
+    assert drain(other) == []
+
+
+def test_resume_replays_missed_events():
+    broker = ProjectEventBroker()
+    first = broker.subscribe("u1")
+    ids = [broker.publish("u1", "stats", {"total": n}) for n in range(5)]
+    broker.unsubscribe("u1", first)
+
+    resumed = broker.subscribe("u1", last_event_id=ids[1])
+
+    assert [m[0] for m in drain(resumed)] == ids[2:]
+
+
+def test_resume_from_evicted_id_sends_resync():
+    broker = ProjectEventBroker(replay_size=100)
+    queue = broker.subscribe("u1")
+    ids = [broker.publish("u1", "stats", {}) for _ in range(150)]
+    broker.unsubscribe("u1", queue)
+
+    resumed = broker.subscribe("u1", last_event_id=ids[9])
+
+    assert [m[1] for m in drain(resumed)] == ["resync"]
+
+
+def test_resume_with_backlog_larger_than_queue_sends_resync():
+    broker = ProjectEventBroker()
+    queue = broker.subscribe("u1")
+    start = broker.publish("u1", "stats", {})
+    for _ in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        broker.publish("u1", "stats", {})
+    broker.unsubscribe("u1", queue)
+
+    resumed = broker.subscribe("u1", last_event_id=start)
+
+    assert [m[1] for m in drain(resumed)] == ["resync"]
+
+
+def test_resume_with_unknown_id_sends_resync():
+    broker = ProjectEventBroker()
+
+    before_restart = broker.subscribe("u1", last_event_id=10)
+    from_the_future = broker.subscribe("u2", last_event_id=10 ** 15)
+
+    assert [m[1] for m in drain(before_restart)] == ["resync"]
+    assert [m[1] for m in drain(from_the_future)] == ["resync"]
+
+
+def test_slow_consumer_is_closed_and_unsubscribed():
+    broker = ProjectEventBroker()
+    queue = broker.subscribe("u1")
+
+    for _ in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        broker.publish("u1", "stats", {})
+
+    assert drain(queue) == [None]
+    assert not broker.has_subscribers("u1")
+
+
+def test_unsubscribe_removes_user():
+    broker = ProjectEventBroker()
+    a = broker.subscribe("u1")
+    b = broker.subscribe("u1")
+
+    broker.unsubscribe("u1", a)
+    assert broker.subscriber_count() == 1
+    broker.unsubscribe("u1", b)
+    assert not broker.has_subscribers("u1")
+    broker.unsubscribe("u1", b)
+
+
+def test_publish_without_stream_keeps_no_history():
+    broker = ProjectEventBroker()
+
+    for n in range(1000):
+        broker.publish(f"user-{n}", "project-created", {"steps": ["..."]})
+
+    assert broker.history_count() == 0
+
+
+def test_idle_histories_expire():
+    broker = ProjectEventBroker(history_ttl=0)
+    queue = broker.subscribe("u1")
+    broker.unsubscribe("u1", queue)
+
+    broker.publish("u2", "stats", {})
+
+    assert broker.history_count() == 0
+
+
+def test_queue_works_inside_event_loop():
+    broker = ProjectEventBroker()
+
+    async def roundtrip():
+        queue = broker.subscribe("u1")
+        broker.publish("u1", "stats", {"total": 1})
+        return await asyncio.wait_for(queue.get(), timeout=1)
+
+    assert asyncio.run(roundtrip())[2] == {"total": 1}
+
+
+def test_format_sse():
+    assert format_sse(7, "stats", {"total": 2}) == 'id: 7\nevent: stats\ndata: {"total":2}\n\n'
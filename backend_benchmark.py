@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Response Compression Benchmark
+Measures bytes on the wire and compression CPU per request for the
+/api/generate-project and /api/projects/{user_id} payloads.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from fastapi.testclient import TestClient
+
+import server
+from server import (
+    CompressedVariantCache,
+    SUPPORTED_ENCODINGS,
+    _CACHED_LEVELS,
+    _FAST_LEVELS,
+    app,
+    compress_body,
+)
+
+PROJECT_TYPES = ["robotics", "iot", "electronics", "automation", "sensors"]
+SKILL_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+SAVED_PROJECTS_PER_USER = 20
+ITERATIONS = 200
+
+client = TestClient(app)
+
+
+def generate(params, encoding="identity"):
+    return client.post("/api/generate-project", json=params, headers={"Accept-Encoding": encoding})
+
+
+def build_payloads():
+    """Return (label, body, cacheable) for the bodies each endpoint sends"""
+    template = {"projectType": "iot", "skillLevel": "expert"}
+    personalized = {**template, "interests": "home automation and voice assistants", "budget": "₹2500"}
+
+    generated = [generate({"projectType": t, "skillLevel": s}).json()
+                 for t in PROJECT_TYPES for s in SKILL_LEVELS]
+    saved_rows = []
+    for i in range(SAVED_PROJECTS_PER_USER):
+        project = generated[i % len(generated)]
+        saved_rows.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "user_id": "benchmark-user",
+            "title": project["title"],
+            "description": project["description"],
+            "project_type": PROJECT_TYPES[i % len(PROJECT_TYPES)],
+            "difficulty": project["difficulty"],
+            "estimated_time": project["estimatedTime"],
+            "estimated_cost": project["estimatedCost"],
+            "components": project["components"],
+            "skills": project["skills"],
+            "steps": project["steps"],
+            "status": "planning",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        })
+    projects_body = json.dumps(saved_rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return [
+        ("generate-project (template)", generate(template).content, True),
+        ("generate-project (with interests)", generate(personalized).content, False),
+        (f"projects/{{user_id}} ({SAVED_PROJECTS_PER_USER} rows)", projects_body, False),
+    ]
+
+
+def cpu_per_call(fn, iterations=ITERATIONS):
+    """Average process CPU time of fn() in microseconds"""
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def report_codecs():
+    print(f"{'':<6}{'encoding':<9}{'fast bytes':>11}{'fast µs':>9}{'max bytes':>11}{'cold µs':>9}{'hit µs':>8}  served as")
+    for label, body, cacheable in build_payloads():
+        print(f"\n📦 {label}: {len(body):,} bytes uncompressed")
+        for encoding in SUPPORTED_ENCODINGS:
+            fast = compress_body(body, encoding, _FAST_LEVELS[encoding])
+            fast_cpu = cpu_per_call(lambda: compress_body(body, encoding, _FAST_LEVELS[encoding]))
+
+            # Cold cache: what a template pays the first time, at maximum level
+            best = compress_body(body, encoding, _CACHED_LEVELS[encoding])
+            cold_cpu = cpu_per_call(lambda: compress_body(body, encoding, _CACHED_LEVELS[encoding]), 20)
+
+            cache = CompressedVariantCache()
+            cache.get(("benchmark",), body, encoding)
+            hit_cpu = cpu_per_call(lambda: cache.get(("benchmark",), body, encoding))
+
+            served = "max, cached" if cacheable else "fast, per request"
+            print(f"{'':<6}{encoding:<9}{len(fast):>11,}{fast_cpu:>9.1f}{len(best):>11,}"
+                  f"{cold_cpu:>9.1f}{hit_cpu:>8.1f}  {served}")
+
+
+def middleware_cpu(body, encoding, template_key=None, iterations=ITERATIONS):
+    """CPU per response through CompressionMiddleware alone, in microseconds"""
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    async def endpoint(scope, receive, send):
+        if template_key is not None:
+            scope.setdefault("state", {})[server.COMPRESSION_KEY] = template_key
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def discard(message):
+        pass
+
+    middleware = server.CompressionMiddleware(endpoint)
+    accept = [(b"accept-encoding", encoding.encode())]
+
+    async def run():
+        for _ in range(iterations):
+            await middleware({"type": "http", "path": "/api/generate-project", "headers": accept}, None, discard)
+
+    asyncio.run(run())  # warm the template cache
+    start = time.process_time()
+    asyncio.run(run())
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def report_middleware():
+    """Per-response CPU the middleware adds, against the identity passthrough"""
+    print("\n⏱️  CompressionMiddleware CPU per response (µs, warm cache)")
+    payloads = build_payloads()
+    template_body, personalized_body = payloads[0][1], payloads[1][1]
+    template_key = ("iot", "expert", json.loads(template_body)["title"])
+
+    baseline_template = middleware_cpu(template_body, "identity", template_key)
+    baseline_personalized = middleware_cpu(personalized_body, "identity")
+    print(f"   {'identity':<9} template {baseline_template:>8.1f}   with interests {baseline_personalized:>8.1f}")
+    for encoding in SUPPORTED_ENCODINGS:
+        template_cpu = middleware_cpu(template_body, encoding, template_key) - baseline_template
+        personalized_cpu = middleware_cpu(personalized_body, encoding) - baseline_personalized
+        print(f"   {encoding:<9} template {template_cpu:>+8.1f}   with interests {personalized_cpu:>+8.1f}")
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print("🚀 Response Compression Benchmark")
+    print("=" * 78)
+    print(f"Available encodings: {', '.join(SUPPORTED_ENCODINGS)}\n")
+    report_codecs()
+    report_middleware()
+    cache = server.compressed_variants
+    print(f"\nTemplate cache: {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()